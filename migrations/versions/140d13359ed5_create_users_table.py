@@ -12,7 +12,7 @@ from sqlalchemy.sql import column, table
 
 from poly.config import get_settings
 from poly.db import UTCNow
-from poly.services.auth import password_context
+from poly.services.passwords import password_context
 
 # revision identifiers, used by Alembic.
 revision = "140d13359ed5"
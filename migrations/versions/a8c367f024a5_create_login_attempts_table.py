@@ -0,0 +1,54 @@
+"""create login attempts table
+
+Revision ID: a8c367f024a5
+Revises: 9ef70bfbd9e0
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from poly.db import UTCNow
+
+# revision identifiers, used by Alembic.
+revision = "a8c367f024a5"
+down_revision = "9ef70bfbd9e0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    schema_upgrades()
+    if context.get_x_argument(as_dictionary=True).get("data", None):
+        data_upgrades()
+
+
+def downgrade() -> None:
+    if context.get_x_argument(as_dictionary=True).get("data", None):
+        data_downgrades()
+    schema_downgrades()
+
+
+def schema_upgrades() -> None:
+    op.create_table(
+        "login_attempts",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("key", sa.String, nullable=False),
+        sa.Column("attempted_at", sa.DateTime, server_default=UTCNow()),
+    )
+    op.create_index("ix_login_attempts_key", "login_attempts", ["key"])
+
+
+def schema_downgrades() -> None:
+    op.drop_index("ix_login_attempts_key", "login_attempts")
+    op.drop_table("login_attempts")
+
+
+def data_upgrades() -> None:
+    pass
+
+
+def data_downgrades() -> None:
+    op.execute("DELETE FROM login_attempts;")
+    op.execute("ALTER SEQUENCE login_attempts_id_seq RESTART;")
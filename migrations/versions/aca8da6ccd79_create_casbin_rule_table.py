@@ -0,0 +1,75 @@
+"""create casbin rule table
+
+Revision ID: aca8da6ccd79
+Revises: a8c367f024a5
+Create Date: 2026-10-18 11:02:47.913530
+
+"""
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from poly.rbac.adapter import VERSION_TRIGGER
+
+# revision identifiers, used by Alembic.
+revision = "aca8da6ccd79"
+down_revision = "a8c367f024a5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    schema_upgrades()
+    if context.get_x_argument(as_dictionary=True).get("data", None):
+        data_upgrades()
+
+
+def downgrade() -> None:
+    if context.get_x_argument(as_dictionary=True).get("data", None):
+        data_downgrades()
+    schema_downgrades()
+
+
+def schema_upgrades() -> None:
+    # Same shape as `casbin_async_sqlalchemy_adapter.CasbinRule`, which may already
+    # have created it through `rbac/seed.py`
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS casbin_rule (
+            id SERIAL PRIMARY KEY,
+            ptype VARCHAR(255),
+            v0 VARCHAR(255),
+            v1 VARCHAR(255),
+            v2 VARCHAR(255),
+            v3 VARCHAR(255),
+            v4 VARCHAR(255),
+            v5 VARCHAR(255)
+        );
+        """
+    )
+
+    # Version stamp used to validate policy snapshots, see `poly.rbac.adapter`
+    op.create_table(
+        "casbin_rule_version",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("version", sa.BigInteger, nullable=False),
+    )
+    op.execute("INSERT INTO casbin_rule_version (id, version) VALUES (1, 1);")
+
+    for statement in VERSION_TRIGGER:
+        op.execute(statement)
+
+
+def schema_downgrades() -> None:
+    op.execute("DROP TRIGGER casbin_rule_version ON casbin_rule;")
+    op.execute("DROP FUNCTION casbin_rule_bump_version;")
+    op.drop_table("casbin_rule_version")
+    op.drop_table("casbin_rule")
+
+
+def data_upgrades() -> None:
+    pass
+
+
+def data_downgrades() -> None:
+    pass
@@ -5,7 +5,7 @@ from sqlalchemy import text
 
 from poly.config import Settings, get_settings
 from poly.db import get_engine, get_session
-from poly.rbac.models import get_enforcer
+from poly.rbac.models import load_enforcer
 from poly.services.resources import get_all_resources
 
 
@@ -28,7 +28,7 @@ async def upgrade(settings: Settings):
     policies.append(["role_admin", "resources", "GET"])
 
     async with get_engine(settings=settings) as engine:
-        enforcer = await get_enforcer(engine=engine)
+        enforcer = await load_enforcer(engine=engine)
 
         await enforcer.add_named_policies("p", policies)
         await enforcer.add_role_for_user(settings.admin_username, "role_admin")
@@ -36,7 +36,8 @@ async def upgrade(settings: Settings):
 
 async def downgrade(settings: Settings):
     async with get_engine(settings=settings) as engine, engine.begin() as conn:
-        await conn.execute(text("DROP TABLE casbin_rule;"))
+        # The table belongs to the migrations
+        await conn.execute(text("DELETE FROM casbin_rule;"))
 
 
 if __name__ == "__main__":
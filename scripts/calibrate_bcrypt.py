@@ -0,0 +1,19 @@
+import argparse
+
+from poly.services.passwords import calibrate_rounds
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Suggest a bcrypt cost that meets a verify latency on this host"
+    )
+    parser.add_argument("--target-ms", type=float, default=250)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    rounds, timings = calibrate_rounds(
+        target=args.target_ms / 1000, samples=args.samples
+    )
+
+    for cost, timing in timings.items():
+        print(f"rounds={cost:<2} verify={timing * 1000:.1f}ms")
+    print(f"BCRYPT_ROUNDS={rounds}")
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -42,6 +43,11 @@ class Settings(BaseSettings):
         title="ADMIN_USERNAME",
         description="Administrator username",
     )
+    bcrypt_rounds: int = Field(
+        default=12,
+        title="BCRYPT_ROUNDS",
+        description="bcrypt cost, see scripts/calibrate_bcrypt.py",
+    )
     db_host: str = Field(
         ...,
         title="DB_HOST",
@@ -72,16 +78,56 @@ class Settings(BaseSettings):
         title="EMAIL_LENGTH",
         description="Email column length",
     )
+    login_attempts_per_email: int = Field(
+        default=5,
+        title="LOGIN_ATTEMPTS_PER_EMAIL",
+        description="Login attempts allowed per email within the window",
+    )
+    login_attempts_per_ip: int = Field(
+        default=20,
+        title="LOGIN_ATTEMPTS_PER_IP",
+        description="Login attempts allowed per client IP within the window",
+    )
+    login_attempts_window: int = Field(
+        default=300,
+        title="LOGIN_ATTEMPTS_WINDOW",
+        description="Login throttle sliding window in seconds",
+    )
+    login_throttle_backend: Literal["memory", "postgres"] = Field(
+        default="memory",
+        title="LOGIN_THROTTLE_BACKEND",
+        description="Where login attempts are counted, postgres to share across workers",
+    )
     name_length: int = Field(
         default=32,
         title="NAME_LENGTH",
         description="Name column length",
     )
+    password_hash_executor: Literal["process", "thread"] = Field(
+        default="thread",
+        title="PASSWORD_HASH_EXECUTOR",
+        description="Pool type used for hashing and verifying passwords",
+    )
     password_hash_length: int = Field(
         default=72,
         title="PASSWORD_HASH_LENGTH",
         description="Password column length",
     )
+    password_hash_queue_size: int = Field(
+        default=16,
+        title="PASSWORD_HASH_QUEUE_SIZE",
+        description="Password hashing jobs allowed to wait for a free worker",
+    )
+    password_hash_workers: int = Field(
+        default=2,
+        title="PASSWORD_HASH_WORKERS",
+        description="Workers in the password hashing pool",
+    )
+    rbac_snapshot_file: str = Field(
+        "",
+        title="RBAC_SNAPSHOT_FILE",
+        description="File to cache the loaded policy in between restarts",
+    )
     refresh_token_expiry: int = Field(
         ...,
         title="REFRESH_TOKEN_EXPIRY",
@@ -92,11 +138,31 @@ class Settings(BaseSettings):
         title="SECRET_KEY",
         description="Secret for hashing access token",
     )
+    stateless_access_tokens: bool = Field(
+        default=False,
+        title="STATELESS_ACCESS_TOKENS",
+        description="Sign user status and role into access tokens",
+    )
+    token_cache_size: int = Field(
+        default=1024,
+        title="TOKEN_CACHE_SIZE",
+        description="Verified access tokens kept in memory, 0 to disable",
+    )
     townships_file: str = Field(
         "",
         title="TOWNSHIPS_FILE",
         description="CSV file for townships data",
     )
+    user_cache_size: int = Field(
+        default=1024,
+        title="USER_CACHE_SIZE",
+        description="Active user statuses kept in memory, 0 to disable",
+    )
+    user_cache_ttl: int = Field(
+        default=30,
+        title="USER_CACHE_TTL",
+        description="Active user status cache expiry in seconds",
+    )
 
 
 @lru_cache
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, MetaData, String
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, MetaData, String
 from sqlalchemy.orm import Mapped, declarative_base, mapped_column, relationship
 
 from poly.config import get_settings
@@ -99,6 +99,21 @@ class User(Base):  # type: ignore
     updated_by: Mapped[str] = mapped_column(String(settings.name_length))
 
 
+class LoginAttempt(Base):
+    __tablename__ = "login_attempts"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    key: Mapped[str] = mapped_column(String, index=True)
+    attempted_at = mapped_column(DateTime, server_default=UTCNow())
+
+
+class PolicyVersion(Base):
+    __tablename__ = "casbin_rule_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger)
+
+
 class Branch(Base):
     __tablename__ = "branches"
 
@@ -1,5 +1,6 @@
 import re
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Any
 
 from pydantic import (
     BaseModel,
@@ -117,6 +118,16 @@ class Locations(BaseModel):
     states: list[State]
 
 
+class Principal(BaseModel):
+    # User details are absent when they come from a stateless access token
+    id: int | None = None
+    name: str
+    email: str | None = None
+    created_at: datetime | None = None
+    role: str | None
+    claims: dict[str, Any]
+
+
 class Profile(BaseModel):
     created_at: str
     email: str
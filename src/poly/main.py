@@ -1,21 +1,22 @@
 from contextlib import asynccontextmanager
 from typing import Annotated
 
-from casbin import AsyncEnforcer, Model
-from casbin_async_sqlalchemy_adapter import Adapter
 from fastapi import APIRouter, Depends, FastAPI
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from poly import __version__
-from poly.config import get_rbac_models, get_settings
+from poly.config import get_settings
+from poly.db.schema import Principal
+from poly.rbac.models import load_enforcer
 from poly.routers import auth, branches, locations, permissions, resources, roles, user
 from poly.services.auth import validate_access_token
+from poly.services.passwords import get_password_hasher
 
 router = APIRouter(tags=["root"])
 
 
 @router.get("/")
-async def root(_: Annotated[str, Depends(validate_access_token)]):
+async def root(_: Annotated[Principal, Depends(validate_access_token)]):
     return {"message": "Welcome to Poly"}
 
 
@@ -35,15 +36,10 @@ async def lifespan(app: FastAPI):
     )
     engine = create_async_engine("".join(uri), echo=True, echo_pool="debug")
 
-    model = Model()
-    model.load_model_from_text(text=get_rbac_models())
-
-    enforcer = AsyncEnforcer(model=model)
-
-    adapter = Adapter(engine=engine, warning=False)
-    await adapter.create_table()
-
-    enforcer.set_adapter(adapter)
+    # `casbin_rule` is created by migrations, so no DDL runs here
+    enforcer = await load_enforcer(
+        engine=engine, snapshot_file=settings.rbac_snapshot_file
+    )
 
     app.state.enforcer = enforcer
     app.state.async_session = async_sessionmaker(engine, expire_on_commit=False)
@@ -53,6 +49,9 @@ async def lifespan(app: FastAPI):
     app.state.enforcer = {}
     app.state.async_session = {}
 
+    get_password_hasher().shutdown()
+    get_password_hasher.cache_clear()
+
     await engine.dispose()
 
 
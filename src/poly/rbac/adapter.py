@@ -0,0 +1,94 @@
+import json
+import logging
+import os
+from collections.abc import Iterable
+from itertools import takewhile
+
+from casbin import Model
+from casbin_async_sqlalchemy_adapter import Adapter, CasbinRule
+from sqlalchemy import select
+
+from poly.db.models import PolicyVersion
+
+logger = logging.getLogger(__name__)
+
+# Bumps the single `casbin_rule_version` row on every write to `casbin_rule`, shared by
+# the migration and the test schema
+VERSION_TRIGGER = [
+    """
+    CREATE OR REPLACE FUNCTION casbin_rule_bump_version() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO casbin_rule_version (id, version) VALUES (1, 1)
+        ON CONFLICT (id) DO UPDATE SET version = casbin_rule_version.version + 1;
+
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE TRIGGER casbin_rule_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON casbin_rule
+    FOR EACH STATEMENT EXECUTE FUNCTION casbin_rule_bump_version();
+    """,
+]
+
+Rule = tuple[str, list[str]]
+
+
+def to_rule(line: CasbinRule) -> Rule:
+    values = (line.v0, line.v1, line.v2, line.v3, line.v4, line.v5)
+    return line.ptype, list(takewhile(lambda value: value is not None, values))
+
+
+def load_rules(model: Model, rules: Iterable[Rule]):
+    for ptype, rule in rules:
+        sec = ptype[0]
+        if sec in model.model and ptype in model.model[sec]:
+            model.model[sec][ptype].policy.append(rule)
+
+
+def read_snapshot(path: str) -> dict | None:
+    try:
+        with open(path) as snapshot:
+            return json.load(snapshot)
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot(path: str, version: int, rules: list[Rule]):
+    # Written aside and renamed so that other workers never read a partial file
+    pending = f"{path}.{os.getpid()}"
+    try:
+        with open(pending, "w") as snapshot:
+            json.dump({"version": version, "rules": rules}, snapshot)
+        os.replace(pending, path)
+    except OSError as error:
+        # The snapshot only speeds up the next boot
+        logger.warning("Could not write policy snapshot %s: %s", path, error)
+
+
+class PolicyAdapter(Adapter):
+    def __init__(self, engine, snapshot_file: str = ""):
+        super().__init__(engine=engine, warning=False)
+        self.snapshot_file = snapshot_file
+
+    async def load_policy(self, model: Model):
+        async with self._session_scope() as session:
+            version = await session.scalar(select(PolicyVersion.version))
+
+            snapshot = None
+            if self.snapshot_file and version:
+                snapshot = read_snapshot(self.snapshot_file)
+
+            if snapshot and snapshot["version"] == version:
+                logger.info("Loading policy snapshot version %s", version)
+                rules = snapshot["rules"]
+            else:
+                # Read after the version so a snapshot is never newer than its stamp
+                result = await session.scalars(select(CasbinRule))
+                rules = [to_rule(line) for line in result.all()]
+
+                if self.snapshot_file and version:
+                    write_snapshot(self.snapshot_file, version=version, rules=rules)
+
+        load_rules(model, rules)
@@ -1,20 +1,29 @@
+import logging
+import time
+
 from casbin import AsyncEnforcer, Model
-from casbin_async_sqlalchemy_adapter import Adapter
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from poly.config import get_rbac_models
+from poly.rbac.adapter import PolicyAdapter
+
+logger = logging.getLogger(__name__)
 
 
-async def get_enforcer(engine: AsyncEngine):  # pragma: no cover
+async def load_enforcer(engine: AsyncEngine, snapshot_file: str = "") -> AsyncEnforcer:
     model = Model()
     model.load_model_from_text(text=get_rbac_models())
 
     enforcer = AsyncEnforcer(model=model)
+    enforcer.set_adapter(PolicyAdapter(engine=engine, snapshot_file=snapshot_file))
 
-    adapter = Adapter(engine=engine, warning=False)
-    await adapter.create_table()
-
-    enforcer.set_adapter(adapter)
+    start = time.perf_counter()
     await enforcer.load_policy()
+    logger.info(
+        "Loaded %d policies and %d role assignments in %.1fms",
+        len(enforcer.get_policy()),
+        len(enforcer.get_grouping_policy()),
+        (time.perf_counter() - start) * 1000,
+    )
 
     return enforcer
@@ -5,7 +5,13 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from poly.config import Settings, get_settings
 from poly.db.schema import Token
-from poly.services.auth import authenticate, generate_token, validate_cookie
+from poly.services.auth import (
+    authenticate,
+    generate_token,
+    get_access_claims,
+    validate_cookie,
+)
+from poly.services.throttle import get_login_throttle
 
 router = APIRouter(tags=["auth"])
 
@@ -17,18 +23,38 @@ async def login(
     response: Response,
     settings: Annotated[Settings, Depends(get_settings)],
 ):
+    throttle = get_login_throttle()
+    await throttle.check(
+        email=form_data.username,
+        ip=request.client.host if request.client else "",
+        async_session=request.app.state.async_session,
+    )
+
     user = await authenticate(
         email=form_data.username,
         password=form_data.password,
         session=request.app.state.async_session,
     )
 
+    await throttle.reset(
+        email=form_data.username, async_session=request.app.state.async_session
+    )
+
+    claims = None
+    if settings.stateless_access_tokens:
+        claims = get_access_claims(
+            enforcer=request.app.state.enforcer,
+            username=user.name,
+            is_active=user.is_active,
+        )
+
     access_token = generate_token(
         audience=settings.access_token_audience,
         expires_in=settings.access_token_expiry,
         issuer=settings.access_token_issuer,
         secret=settings.secret_key,
         username=user.name,
+        claims=claims,
     )
 
     refresh_token = generate_token(
@@ -51,15 +77,24 @@ async def login(
 
 @router.get("/token", response_model=Token)
 async def token(
+    request: Request,
     settings: Annotated[Settings, Depends(get_settings)],
     username: Annotated[str, Depends(validate_cookie)],
 ):  # pragma: no cover
+    claims = None
+    if settings.stateless_access_tokens:
+        # `validate_cookie` only lets active users through
+        claims = get_access_claims(
+            enforcer=request.app.state.enforcer, username=username, is_active=True
+        )
+
     access_token = generate_token(
         audience=settings.access_token_audience,
         expires_in=settings.access_token_expiry,
         issuer=settings.access_token_issuer,
         secret=settings.secret_key,
         username=username,
+        claims=claims,
     )
 
     return {
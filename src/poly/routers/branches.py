@@ -3,7 +3,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 
-from poly.db.schema import BranchDetails, Branches, NewBranch
+from poly.db.schema import BranchDetails, Branches, NewBranch, Principal
 from poly.services.branches import (
     delete_branch,
     get_branch_by_id,
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/branches", tags=["branches"])
 
 @router.get("/", response_model=Branches)
 async def get_paginated_branches(
-    _: Annotated[str, Depends(check_permission)],
+    _: Annotated[Principal, Depends(check_permission)],
     request: Request,
     id: int = 0,
     per_page: int = 10,
@@ -41,7 +41,7 @@ async def get_paginated_branches(
 
 @router.get("/{branch_id}", response_model=BranchDetails)
 async def get_single_branch(
-    _: Annotated[str, Depends(check_permission)],
+    _: Annotated[Principal, Depends(check_permission)],
     branch_id: int,
     request: Request,
 ):
@@ -71,15 +71,15 @@ async def get_single_branch(
 async def create_new_branch(
     branch: NewBranch,
     request: Request,
-    username: Annotated[str, Depends(check_permission)],
+    principal: Annotated[Principal, Depends(check_permission)],
 ):
     try:
         await save_branch(
             name=branch.name,
             address=branch.address,
             township_id=branch.township_id,
-            created_by=username,
-            updated_by=username,
+            created_by=principal.name,
+            updated_by=principal.name,
             async_session=request.app.state.async_session,
         )
     except ValueError as error:
@@ -96,7 +96,7 @@ async def update_existing_branch(
     branch: NewBranch,
     branch_id: int,
     request: Request,
-    username: Annotated[str, Depends(check_permission)],
+    principal: Annotated[Principal, Depends(check_permission)],
 ):
     saved_branch = await get_branch_by_id(
         id=branch_id, async_session=request.app.state.async_session
@@ -113,7 +113,7 @@ async def update_existing_branch(
             name=branch.name,
             address=branch.address,
             township_id=branch.township_id,
-            updated_by=username,
+            updated_by=principal.name,
             async_session=request.app.state.async_session,
         )
     except ValueError as error:
@@ -127,7 +127,7 @@ async def update_existing_branch(
 
 @router.delete("/{branch_id}")
 async def delete_existing_branch(
-    _: Annotated[str, Depends(check_permission)],
+    _: Annotated[Principal, Depends(check_permission)],
     branch_id: int,
     request: Request,
 ):
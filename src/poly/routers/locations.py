@@ -2,7 +2,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Request
 
-from poly.db.schema import Locations
+from poly.db.schema import Locations, Principal
 from poly.services.auth import validate_access_token
 from poly.services.locations import get_all_locations
 
@@ -11,7 +11,7 @@ router = APIRouter(prefix="/locations", tags=["locations"])
 
 @router.get("/", response_model=Locations)
 async def get_locations(
-    _: Annotated[str, Depends(validate_access_token)],
+    _: Annotated[Principal, Depends(validate_access_token)],
     request: Request,
 ):
     states = await get_all_locations(async_session=request.app.state.async_session)
@@ -1,8 +1,8 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 
-from poly.db.schema import Permissions
+from poly.db.schema import Permissions, Principal
 from poly.services.auth import validate_access_token
 from poly.services.permissions import get_permissions_by_role
 
@@ -12,11 +12,16 @@ router = APIRouter(prefix="/permissions", tags=["permissions"])
 @router.get("/", response_model=Permissions)
 async def get_permissions(
     request: Request,
-    username: Annotated[str, Depends(validate_access_token)],
+    principal: Annotated[Principal, Depends(validate_access_token)],
 ):
-    enforcer = request.app.state.enforcer
+    if not principal.role:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not assigned to any role.",
+        )
 
-    role = enforcer.get_filtered_named_grouping_policy("g", 0, username)[0][1]
-    permissions = await get_permissions_by_role(enforcer=enforcer, role=role)
+    permissions = await get_permissions_by_role(
+        enforcer=request.app.state.enforcer, role=principal.role
+    )
 
-    return {"role": role.split("_")[1], "permissions": permissions}
+    return {"role": principal.role.split("_")[1], "permissions": permissions}
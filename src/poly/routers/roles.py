@@ -2,7 +2,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 
-from poly.db.schema import Roles
+from poly.db.schema import Principal, Roles
 from poly.services.permissions import check_permission
 from poly.services.roles import get_roles, get_roles_count
 
@@ -11,7 +11,7 @@ router = APIRouter(prefix="/roles", tags=["roles"])
 
 @router.get("/", response_model=Roles)
 async def get_paginated_roles(
-    _: Annotated[str, Depends(check_permission)],
+    _: Annotated[Principal, Depends(check_permission)],
     request: Request,
     id: int = 0,
     per_page: int = 10,
@@ -1,18 +1,28 @@
+import hashlib
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Annotated, Mapping
 
+from casbin import AsyncEnforcer
 from fastapi import Cookie, Depends, Header, HTTPException, Request, status
 from jose import jwt
 from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
-from passlib.context import CryptContext
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from poly.cache import LRUCache
 from poly.config import Settings, get_settings
 from poly.db.models import User
+from poly.db.schema import Principal
 from poly.services import oauth2_scheme
-from poly.services.user import get_user_by_email, get_user_by_name
-
-password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from poly.services.passwords import get_password_hasher
+from poly.services.roles import get_role_by_user
+from poly.services.user import (
+    get_token_generation,
+    get_user_by_email,
+    get_user_status,
+    update_password,
+)
 
 
 def validate_jwt(
@@ -45,15 +55,47 @@ def validate_jwt(
         )
 
 
+@lru_cache
+def get_token_cache() -> LRUCache[tuple[bytes, str], Mapping]:
+    return LRUCache(maxsize=get_settings().token_cache_size)
+
+
+def validate_cached_jwt(
+    audience: str,
+    issuer: str,
+    secret: str,
+    subject: str,
+    token: str,
+) -> Mapping:
+    # Keyed by digest so raw tokens are not kept around in memory
+    key = (hashlib.sha256(token.encode()).digest(), subject)
+    cache = get_token_cache()
+
+    claims = cache.get(key)
+    if claims is None:
+        claims = validate_jwt(
+            audience=audience,
+            issuer=issuer,
+            secret=secret,
+            subject=subject,
+            token=token,
+        )
+        cache.set(key, claims, expires_at=claims["exp"])
+
+    return claims
+
+
 def generate_token(
     audience: str,
     expires_in: int,
     issuer: str,
     secret: str,
     username: str,
+    claims: Mapping | None = None,
 ) -> str:
     return jwt.encode(
         claims={
+            **(claims or {}),
             "aud": audience,
             "exp": datetime.utcnow() + timedelta(minutes=expires_in),
             "iss": issuer,
@@ -64,6 +106,28 @@ def generate_token(
     )
 
 
+def get_access_claims(enforcer: AsyncEnforcer, username: str, is_active: bool) -> dict:
+    return {
+        "active": is_active,
+        "gen": get_token_generation(username),
+        "role": get_role_by_user(enforcer=enforcer, username=username),
+    }
+
+
+def check_access_claims(claims: Mapping):
+    if not claims["active"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user",
+        )
+
+    if claims["gen"] < get_token_generation(claims["sub"]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Revoked token",
+        )
+
+
 async def authenticate(email: str, password: str, session: async_sessionmaker) -> User:
     user = await get_user_by_email(email=email, async_session=session)
     if not user:
@@ -72,16 +136,25 @@ async def authenticate(email: str, password: str, session: async_sessionmaker) -
             detail="Incorrect email or password",
         )
 
-    if not password_context.verify(password, user.password.strip()):
+    is_valid, new_hash = await get_password_hasher().verify_and_update(
+        password, user.password.strip()
+    )
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
+
+    # Stored hash was made with a different bcrypt cost
+    if new_hash:
+        await update_password(id=user.id, password=new_hash, async_session=session)
+        user.password = new_hash
+
     return user
 
 
-async def get_active_user(async_session: async_sessionmaker, username: str) -> User:
-    user = await get_user_by_name(name=username, async_session=async_session)
+async def get_active_user(async_session: async_sessionmaker, username: str) -> Row:
+    user = await get_user_status(name=username, async_session=async_session)
 
     if not user:
         raise HTTPException(
@@ -98,6 +171,17 @@ async def get_active_user(async_session: async_sessionmaker, username: str) -> U
     return user
 
 
+def get_principal(enforcer: AsyncEnforcer, user: Row, claims: Mapping) -> Principal:
+    return Principal(
+        id=user.id,
+        name=user.name,
+        email=user.email,
+        created_at=user.created_at,
+        role=get_role_by_user(enforcer=enforcer, username=user.name),
+        claims=claims,
+    )
+
+
 async def validate_cookie(
     request: Request,
     settings: Annotated[Settings, Depends(get_settings)],
@@ -129,18 +213,32 @@ async def validate_access_token(
     settings: Annotated[Settings, Depends(get_settings)],
     token: Annotated[str, Depends(oauth2_scheme)],
     x_username: Annotated[str, Header()],
-) -> str:  # pragma: no cover
+) -> Principal:  # pragma: no cover
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Empty token",
         )
 
+    if settings.stateless_access_tokens:
+        claims = validate_cached_jwt(
+            audience=settings.access_token_audience,
+            issuer=settings.access_token_issuer,
+            secret=settings.secret_key,
+            subject=x_username,
+            token=token,
+        )
+
+        # Tokens issued before the mode was enabled are checked against the database
+        if "gen" in claims:
+            check_access_claims(claims)
+            return Principal(name=claims["sub"], role=claims["role"], claims=claims)
+
     user = await get_active_user(
         async_session=request.app.state.async_session, username=x_username
     )
 
-    claims = validate_jwt(
+    claims = validate_cached_jwt(
         audience=settings.access_token_audience,
         issuer=settings.access_token_issuer,
         secret=settings.secret_key,
@@ -148,4 +246,4 @@ async def validate_access_token(
         token=token,
     )
 
-    return claims["sub"]
+    return get_principal(enforcer=request.app.state.enforcer, user=user, claims=claims)
@@ -0,0 +1,109 @@
+import asyncio
+import statistics
+import timeit
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from passlib.hash import bcrypt
+
+from poly.config import get_settings
+
+T = TypeVar("T")
+
+settings = get_settings()
+password_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    # Hashes at any other cost are replaced on the next successful login
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+    bcrypt__max_rounds=settings.bcrypt_rounds,
+)
+
+
+# Module level so that they can be pickled into a process pool
+def hash_password(secret: str) -> str:
+    return password_context.hash(secret)
+
+
+def verify_password(secret: str, hash: str) -> bool:
+    return password_context.verify(secret, hash)
+
+
+def verify_and_update_password(secret: str, hash: str) -> tuple[bool, str | None]:
+    return password_context.verify_and_update(secret, hash)
+
+
+def calibrate_rounds(target: float, samples: int = 3) -> tuple[int, dict[int, float]]:
+    # Returns the highest cost whose median verify time stays within `target` seconds
+    timings: dict[int, float] = {}
+
+    for rounds in range(bcrypt.min_rounds, bcrypt.max_rounds + 1):
+        hash = bcrypt.using(rounds=rounds).hash("calibration")
+        timings[rounds] = statistics.median(
+            timeit.repeat(
+                lambda: bcrypt.verify("calibration", hash), number=1, repeat=samples
+            )
+        )
+        if timings[rounds] > target:
+            break
+
+    within_target = [rounds for rounds, timing in timings.items() if timing <= target]
+    return max(within_target, default=bcrypt.min_rounds), timings
+
+
+class PasswordHasher:
+    def __init__(self, executor: Executor, max_pending: int):
+        self.executor = executor
+        self.max_pending = max_pending
+        self.pending = 0
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        # Shed load instead of queueing behind a login burst
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy. Please try again later.",
+                headers={"Retry-After": "1"},
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, secret: str) -> str:
+        return await self._run(hash_password, secret)
+
+    async def verify(self, secret: str, hash: str) -> bool:
+        return await self._run(verify_password, secret, hash)
+
+    async def verify_and_update(
+        self, secret: str, hash: str
+    ) -> tuple[bool, str | None]:
+        return await self._run(verify_and_update_password, secret, hash)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_password_hasher() -> PasswordHasher:
+    executor: Executor
+    if settings.password_hash_executor == "process":
+        executor = ProcessPoolExecutor(max_workers=settings.password_hash_workers)
+    else:
+        executor = ThreadPoolExecutor(
+            max_workers=settings.password_hash_workers,
+            thread_name_prefix="password-hasher",
+        )
+
+    return PasswordHasher(
+        executor=executor,
+        max_pending=settings.password_hash_workers + settings.password_hash_queue_size,
+    )
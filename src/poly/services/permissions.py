@@ -3,17 +3,18 @@ from typing import Annotated
 from casbin import AsyncEnforcer
 from fastapi import Depends, HTTPException, Request, status
 
+from poly.db.schema import Principal
 from poly.services.auth import validate_access_token
 
 
 async def check_permission(
     request: Request,
-    username: Annotated[str, Depends(validate_access_token)],
-) -> str:
+    principal: Annotated[Principal, Depends(validate_access_token)],
+) -> Principal:
     enforcer = request.app.state.enforcer
 
     is_allowed = enforcer.enforce(
-        username, request.url.path.split("/")[1], request.method
+        principal.name, request.url.path.split("/")[1], request.method
     )
     if not is_allowed:
         raise HTTPException(
@@ -21,7 +22,7 @@ async def check_permission(
             detail="User is not authorized to access this resource.",
         )
 
-    return username
+    return principal
 
 
 async def get_permissions_by_role(enforcer: AsyncEnforcer, role: str) -> list[dict]:
@@ -1,3 +1,4 @@
+from casbin import AsyncEnforcer
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
@@ -19,3 +20,9 @@ async def get_roles_count(async_session: async_sessionmaker) -> int:  # pragma:
     async with async_session() as session, session.begin():
         result = await session.execute(select(func.count()).select_from(Role))
         return result.scalar_one()
+
+
+def get_role_by_user(enforcer: AsyncEnforcer, username: str) -> str | None:
+    # Returns a list in the form of [[{username}, {role_name}]]
+    roles = enforcer.get_filtered_named_grouping_policy("g", 0, username)
+    return roles[0][1] if roles else None
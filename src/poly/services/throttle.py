@@ -0,0 +1,153 @@
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Protocol
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from poly.config import get_settings
+from poly.db.models import LoginAttempt
+
+
+class ThrottleBackend(Protocol):
+    async def count(
+        self, keys: list[str], window: int, async_session: async_sessionmaker
+    ) -> dict[str, int]: ...
+
+    async def add(
+        self, keys: list[str], window: int, async_session: async_sessionmaker
+    ): ...
+
+    async def reset(self, key: str, async_session: async_sessionmaker): ...
+
+
+class MemoryThrottleBackend:
+    def __init__(self, max_keys: int = 10_000):
+        self.attempts: dict[str, deque[float]] = {}
+        self.max_keys = max_keys
+
+    def _prune(self, key: str, since: float) -> deque[float]:
+        attempts = self.attempts.get(key, deque())
+        while attempts and attempts[0] <= since:
+            attempts.popleft()
+        return attempts
+
+    async def count(
+        self, keys: list[str], window: int, async_session: async_sessionmaker
+    ) -> dict[str, int]:
+        since = time.monotonic() - window
+        return {key: len(self._prune(key, since)) for key in keys}
+
+    async def add(
+        self, keys: list[str], window: int, async_session: async_sessionmaker
+    ):
+        now = time.monotonic()
+
+        # Drop keys that have left the window so a spray of emails cannot grow memory
+        if len(self.attempts) >= self.max_keys:
+            for key in list(self.attempts):
+                if not self._prune(key, now - window):
+                    del self.attempts[key]
+
+        for key in keys:
+            self.attempts.setdefault(key, deque()).append(now)
+
+    async def reset(self, key: str, async_session: async_sessionmaker):
+        self.attempts.pop(key, None)
+
+
+class PostgresThrottleBackend:
+    async def count(
+        self, keys: list[str], window: int, async_session: async_sessionmaker
+    ) -> dict[str, int]:
+        since = datetime.utcnow() - timedelta(seconds=window)
+        async with async_session() as session, session.begin():
+            result = await session.execute(
+                select(LoginAttempt.key, func.count())
+                .where(LoginAttempt.key.in_(keys))
+                .where(LoginAttempt.attempted_at > since)
+                .group_by(LoginAttempt.key)
+            )
+            return {key: 0 for key in keys} | dict(result.tuples().all())
+
+    async def add(
+        self, keys: list[str], window: int, async_session: async_sessionmaker
+    ):
+        now = datetime.utcnow()
+        async with async_session() as session, session.begin():
+            await session.execute(
+                delete(LoginAttempt)
+                .where(LoginAttempt.key.in_(keys))
+                .where(LoginAttempt.attempted_at <= now - timedelta(seconds=window))
+            )
+            await session.execute(
+                insert(LoginAttempt),
+                [{"key": key, "attempted_at": now} for key in keys],
+            )
+
+    async def reset(self, key: str, async_session: async_sessionmaker):
+        async with async_session() as session, session.begin():
+            await session.execute(delete(LoginAttempt).where(LoginAttempt.key == key))
+
+
+class LoginThrottle:
+    def __init__(
+        self,
+        backend: ThrottleBackend,
+        email_limit: int,
+        ip_limit: int,
+        window: int,
+    ):
+        self.backend = backend
+        self.email_limit = email_limit
+        self.ip_limit = ip_limit
+        self.window = window
+        self.allowed = 0
+        self.rejected = 0
+
+    async def check(self, email: str, ip: str, async_session: async_sessionmaker):
+        # Runs before the user lookup and bcrypt so rejected attempts cost no hashing
+        keys = [f"email:{email}", f"ip:{ip}"]
+        counts = await self.backend.count(
+            keys=keys, window=self.window, async_session=async_session
+        )
+
+        if counts[keys[0]] >= self.email_limit or counts[keys[1]] >= self.ip_limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts. Please try again later.",
+                headers={"Retry-After": str(self.window)},
+            )
+
+        self.allowed += 1
+        await self.backend.add(
+            keys=keys, window=self.window, async_session=async_session
+        )
+
+    async def reset(self, email: str, async_session: async_sessionmaker):
+        await self.backend.reset(key=f"email:{email}", async_session=async_session)
+
+    def stats(self) -> dict[str, int]:
+        return {"allowed": self.allowed, "rejected": self.rejected}
+
+
+@lru_cache
+def get_login_throttle() -> LoginThrottle:
+    settings = get_settings()
+
+    backend: ThrottleBackend
+    if settings.login_throttle_backend == "postgres":
+        backend = PostgresThrottleBackend()
+    else:
+        backend = MemoryThrottleBackend()
+
+    return LoginThrottle(
+        backend=backend,
+        email_limit=settings.login_attempts_per_email,
+        ip_limit=settings.login_attempts_per_ip,
+        window=settings.login_attempts_window,
+    )
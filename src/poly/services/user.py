@@ -1,10 +1,37 @@
-from sqlalchemy import select
+import time
+from functools import lru_cache
+
+from sqlalchemy import Row, select, update
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from poly.cache import LRUCache
+from poly.config import get_settings
 from poly.db.models import User
 from poly.db.schema import UserUpdate
 
 
+@lru_cache
+def get_user_cache() -> LRUCache[str, Row]:
+    return LRUCache(maxsize=get_settings().user_cache_size)
+
+
+@lru_cache
+def get_token_generations() -> dict[str, int]:
+    # Only users whose tokens have been revoked are tracked
+    return {}
+
+
+def get_token_generation(name: str) -> int:
+    return get_token_generations().get(name, 0)
+
+
+def invalidate_user(name: str):
+    get_user_cache().invalidate(name)
+
+    # Revokes stateless access tokens signed with an older generation
+    get_token_generations()[name] = get_token_generation(name) + 1
+
+
 async def get_user_by_email(
     email: str, async_session: async_sessionmaker
 ) -> User | None:
@@ -19,6 +46,34 @@ async def get_user_by_name(name: str, async_session: async_sessionmaker) -> User
         return result.one_or_none()
 
 
+async def get_user_status(name: str, async_session: async_sessionmaker) -> Row | None:
+    cache = get_user_cache()
+
+    user = cache.get(name)
+    if user is None:
+        async with async_session() as session, session.begin():
+            result = await session.execute(
+                select(
+                    User.id, User.name, User.email, User.is_active, User.created_at
+                ).where(User.name == name)
+            )
+            user = result.one_or_none()
+
+        if user:
+            cache.set(
+                name, user, expires_at=time.time() + get_settings().user_cache_ttl
+            )
+
+    return user
+
+
+async def update_password(id: int, password: str, async_session: async_sessionmaker):
+    async with async_session() as session, session.begin():
+        await session.execute(
+            update(User).where(User.id == id).values(password=password)
+        )
+
+
 async def update_user(
     fields: UserUpdate, async_session: async_sessionmaker
 ):  # pragma: no cover
@@ -27,3 +82,5 @@ async def update_user(
         for k, v in iter(fields):
             setattr(user, k, v)
         session.add(user)
+
+    invalidate_user(user.name)
@@ -13,9 +13,12 @@ from sqlalchemy.pool import NullPool
 
 from poly.config import Settings, get_rbac_models, get_settings
 from poly.db.models import Base, Branch, City, Resource, Role, State, Township, User
+from poly.db.schema import Principal
 from poly.main import create_app
+from poly.rbac.adapter import VERSION_TRIGGER
 from poly.services import oauth2_scheme
-from poly.services.auth import password_context, validate_access_token
+from poly.services.auth import get_active_user, get_principal, validate_access_token
+from poly.services.passwords import password_context
 
 
 def override_get_settings() -> Settings:
@@ -62,13 +65,19 @@ async def override_validate_access_token(
     settings: Annotated[Settings, Depends(get_settings)],
     token: Annotated[str, Depends(oauth2_scheme)],
     x_username: Annotated[str, Header()],
-) -> str:  # pragma: no cover
+) -> Principal:  # pragma: no cover
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Empty token",
         )
-    return x_username
+
+    user = await get_active_user(
+        async_session=request.app.state.async_session, username=x_username
+    )
+    return get_principal(
+        enforcer=request.app.state.enforcer, user=user, claims={"sub": x_username}
+    )
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -291,6 +300,11 @@ async def async_enforcer(db_engine):
     adapter = Adapter(engine=db_engine, warning=False)
     await adapter.create_table()
 
+    # Installed by the `casbin_rule` migration outside of tests
+    async with db_engine.begin() as conn:
+        for statement in VERSION_TRIGGER:
+            await conn.execute(text(statement))
+
     enforcer.set_adapter(adapter)
     await enforcer.load_policy()
 
@@ -1,7 +1,28 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from fastapi import HTTPException, status
-
-from poly.services.auth import authenticate, get_active_user
+from passlib.hash import bcrypt
+from sqlalchemy import update
+
+from poly.db.models import User
+from poly.services.auth import (
+    authenticate,
+    check_access_claims,
+    generate_token,
+    get_access_claims,
+    get_active_user,
+    get_token_cache,
+    validate_cached_jwt,
+)
+from poly.services.passwords import PasswordHasher, password_context
+from poly.services.throttle import (
+    LoginThrottle,
+    MemoryThrottleBackend,
+    PostgresThrottleBackend,
+)
+from poly.services.user import get_user_cache, invalidate_user
 
 
 @pytest.mark.asyncio(scope="session")
@@ -25,6 +46,27 @@ async def test_authenticate(db_session, user):
     assert result is not None
 
 
+@pytest.mark.asyncio(scope="session")
+async def test_authenticate_rehashes_password(db_session, settings, unauthorized_user):
+    async with db_session() as session, session.begin():
+        await session.execute(
+            update(User)
+            .where(User.id == unauthorized_user.id)
+            .values(password=bcrypt.using(rounds=4).hash("passwd"))
+        )
+
+    result = await authenticate(
+        email=unauthorized_user.email, password="passwd", session=db_session
+    )
+
+    async with db_session() as session, session.begin():
+        saved = await session.get(User, unauthorized_user.id)
+
+    assert saved.password == result.password
+    assert bcrypt.from_string(saved.password).rounds == settings.bcrypt_rounds
+    assert password_context.verify("passwd", saved.password)
+
+
 @pytest.mark.asyncio(scope="session")
 async def test_token_with_empty_cookie(client, user):
     response = await client.get("/token", headers={"X-Username": user.name})
@@ -62,3 +104,130 @@ async def test_get_active_user(db_session, inactive_user, user):
 
     result = await get_active_user(async_session=db_session, username="user")
     assert result.name == user.name
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_get_active_user_is_cached(db_session, user):
+    cache = get_user_cache()
+    invalidate_user(user.name)
+    hits, misses = cache.hits, cache.misses
+
+    for _ in range(2):
+        result = await get_active_user(async_session=db_session, username=user.name)
+        assert result.is_active
+
+    assert cache.misses == misses + 1
+    assert cache.hits == hits + 1
+
+    invalidate_user(user.name)
+    assert cache.get(user.name) is None
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_password_hasher_sheds_load():
+    hasher = PasswordHasher(executor=ThreadPoolExecutor(max_workers=1), max_pending=1)
+    hash = password_context.hash("passwd")
+
+    pending = asyncio.ensure_future(hasher.verify("passwd", hash))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await hasher.verify("passwd", hash)
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    assert await pending
+    assert hasher.pending == 0
+
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_validate_cached_jwt(settings, user):
+    token = generate_token(
+        audience=settings.access_token_audience,
+        expires_in=settings.access_token_expiry,
+        issuer=settings.access_token_issuer,
+        secret=settings.secret_key,
+        username=user.name,
+    )
+    cache = get_token_cache()
+    hits, misses = cache.hits, cache.misses
+
+    for _ in range(2):
+        claims = validate_cached_jwt(
+            audience=settings.access_token_audience,
+            issuer=settings.access_token_issuer,
+            secret=settings.secret_key,
+            subject=user.name,
+            token=token,
+        )
+        assert claims["sub"] == user.name
+
+    assert cache.misses == misses + 1
+    assert cache.hits == hits + 1
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_check_access_claims(async_enforcer, settings, user):
+    token = generate_token(
+        audience=settings.access_token_audience,
+        expires_in=settings.access_token_expiry,
+        issuer=settings.access_token_issuer,
+        secret=settings.secret_key,
+        username=user.name,
+        claims=get_access_claims(
+            enforcer=async_enforcer, username=user.name, is_active=True
+        ),
+    )
+    claims = validate_cached_jwt(
+        audience=settings.access_token_audience,
+        issuer=settings.access_token_issuer,
+        secret=settings.secret_key,
+        subject=user.name,
+        token=token,
+    )
+    assert claims["role"] == "role_admin"
+
+    check_access_claims(claims)
+
+    with pytest.raises(HTTPException) as exc_info:
+        check_access_claims({**claims, "active": False})
+    assert exc_info.value.status_code == status.HTTP_403_FORBIDDEN
+    assert exc_info.value.detail == "Inactive user"
+
+    invalidate_user(user.name)
+
+    with pytest.raises(HTTPException) as exc_info:
+        check_access_claims(claims)
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+    assert exc_info.value.detail == "Revoked token"
+
+
+@pytest.mark.parametrize("backend", [MemoryThrottleBackend, PostgresThrottleBackend])
+@pytest.mark.asyncio(scope="session")
+async def test_login_throttle(backend, db_session):
+    throttle = LoginThrottle(backend=backend(), email_limit=2, ip_limit=3, window=60)
+
+    for _ in range(2):
+        await throttle.check(
+            email="a@mail.com", ip="10.0.0.1", async_session=db_session
+        )
+
+    # Email limit
+    with pytest.raises(HTTPException) as exc_info:
+        await throttle.check(
+            email="a@mail.com", ip="10.0.0.1", async_session=db_session
+        )
+    assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    # IP limit
+    await throttle.check(email="b@mail.com", ip="10.0.0.1", async_session=db_session)
+    with pytest.raises(HTTPException):
+        await throttle.check(
+            email="c@mail.com", ip="10.0.0.1", async_session=db_session
+        )
+
+    await throttle.reset(email="a@mail.com", async_session=db_session)
+    await throttle.check(email="a@mail.com", ip="10.0.0.2", async_session=db_session)
+
+    assert throttle.stats() == {"allowed": 4, "rejected": 2}
@@ -0,0 +1,37 @@
+import time
+
+from poly.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    expires_at = time.time() + 60
+
+    cache.set("a", 1, expires_at=expires_at)
+    cache.set("b", 2, expires_at=expires_at)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3, expires_at=expires_at)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2}
+
+
+def test_lru_cache_expires_entries():
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+
+    cache.set("a", 1, expires_at=time.time() - 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_invalidate():
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+
+    cache.set("a", 1, expires_at=time.time() + 60)
+    cache.invalidate("a")
+
+    assert cache.get("a") is None
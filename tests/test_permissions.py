@@ -14,3 +14,18 @@ async def test_get_permissions(client, user):
     assert data["role"] == "admin"
     for permission in data["permissions"]:
         assert permission["resource"] in ["branches", "locations", "resources", "roles"]
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_get_permissions_without_role(client, unauthorized_user):
+    response = await client.get(
+        "/permissions/",
+        headers={
+            "Authorization": "Bearer eyabc.def.ghi",
+            "X-Username": unauthorized_user.name,
+        },
+    )
+    data = response.json()
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert data["detail"] == "User is not assigned to any role."